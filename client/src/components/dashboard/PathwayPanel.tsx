@@ -190,7 +190,10 @@ export function PathwayPanel({
                                                     className="uppercase tracking-wide"
                                                 >
                                                     {rec.power.toFixed(0)}W •{" "}
-                                                    {rec.current.toFixed(1)}A
+                                                    {rec.current.toFixed(1)}A at{" "}
+                                                    {new Date(
+                                                        rec.timestamp * 1000,
+                                                    ).toLocaleTimeString()}
                                                 </Body>
                                                 <div className="flex items-center gap-2">
                                                     <Body muted>
@@ -198,7 +201,7 @@ export function PathwayPanel({
                                                         {rec.cost_per_hour.toFixed(
                                                             3,
                                                         )}
-                                                        /hr
+                                                        /hr at issue
                                                     </Body>
                                                     {rec.pricing_tier && (
                                                         <Badge
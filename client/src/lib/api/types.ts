@@ -48,6 +48,8 @@ export interface PathwayAnomaly {
     diff?: number;
 }
 
+// Numeric fields are a snapshot from when the recommendation was issued;
+// a new one is only emitted when the device's rule conditions change.
 export interface PathwayRecommendation {
     device_id: string;
     device_type: string;
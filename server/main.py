@@ -5,6 +5,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from routes.routes import router
 from services.grid_context import grid_context_service
 from services.devices import device_manager
+from services.pathway_output import pathway_output_service
 
 
 @asynccontextmanager
@@ -17,6 +18,7 @@ async def lifespan(app: FastAPI):
     
     device_manager.start_background_task()
     grid_context_service.start_background_task()
+    pathway_output_service.start_background_task()
     
     print("Data streams initialized:")
     print("- Internal stream: 4 devices (motor, HVAC, compressor, lighting) @ 10Hz")
@@ -26,6 +28,7 @@ async def lifespan(app: FastAPI):
     
     await device_manager.stop_background_task()
     await grid_context_service.stop_background_task()
+    await pathway_output_service.stop_background_task()
     print("All data streams stopped")
 
 
@@ -8,20 +8,138 @@ Provides endpoints to access Pathway processing results:
 """
 
 from fastapi import APIRouter
-from typing import List, Dict, Any
-import json
+from functools import wraps
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+import asyncio
 import os
+import time
 from pathlib import Path
+from services.pathway_output import (
+    PATHWAY_OUTPUT_DIR,
+    OUTPUT_FILES,
+    pathway_output_service,
+    iter_jsonl_reversed,
+    parse_jsonl_lines,
+    read_fingerprint,
+    read_tail_lines
+)
 
 router = APIRouter()
 
-PATHWAY_OUTPUT_DIR = Path("pathway_output")
+COUNT_CHUNK_BYTES = 1024 * 1024
+RESPONSE_CACHE_TTL = 0.2  # seconds
+RESPONSE_CACHE_MAX_ENTRIES = 64
+STATS_SCAN_LINES = 100
+STATS_SCAN_PATIENCE = 20  # entries without a new device type before stopping
+
+# path -> (mtime_ns, size, line_count, counted_offset, fingerprint)
+_LINE_COUNT_CACHE: Dict[str, Tuple[int, int, int, int, bytes]] = {}
+
+# (endpoint, args, file mtimes, buffer versions) -> (expiry, response)
+_RESPONSE_CACHE: Dict[tuple, Tuple[float, Any]] = {}
+
+
+def _mtime_ns(filepath: Path) -> int:
+    try:
+        return os.stat(filepath).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _store_response(key: tuple, now: float, response: Any) -> None:
+    if len(_RESPONSE_CACHE) >= RESPONSE_CACHE_MAX_ENTRIES:
+        for stale_key, (expiry, _) in list(_RESPONSE_CACHE.items()):
+            if expiry <= now:
+                _RESPONSE_CACHE.pop(stale_key, None)
+    _RESPONSE_CACHE[key] = (now + RESPONSE_CACHE_TTL, response)
+
+
+def cached_response(*filenames: str):
+    """
+    Cache an endpoint response for RESPONSE_CACHE_TTL seconds
+    
+    The modification times of the given output files and the versions of their
+    in-memory buffers are part of the cache key, so a response is never reused
+    once Pathway writes to a file or the watcher picks up new entries.
+    Supports both sync and async endpoints; for async endpoints the key's
+    file stats are taken in a worker thread.
+    
+    Args:
+        filenames: Output files the endpoint reads from
+    """
+    def decorator(func):
+        def lookup(args, kwargs):
+            mtimes = tuple(_mtime_ns(PATHWAY_OUTPUT_DIR / name) for name in filenames)
+            versions = tuple(pathway_output_service.get_version(name) for name in filenames)
+            key = (func.__name__, args, tuple(sorted(kwargs.items())), mtimes, versions)
+            now = time.monotonic()
+            cached = _RESPONSE_CACHE.get(key)
+            hit = cached is not None and cached[0] > now
+            return key, now, cached[1] if hit else None, hit
+        
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key, now, response, hit = await asyncio.to_thread(lookup, args, kwargs)
+                if not hit:
+                    response = await func(*args, **kwargs)
+                    _store_response(key, now, response)
+                return response
+            return async_wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, now, response, hit = lookup(args, kwargs)
+            if not hit:
+                response = func(*args, **kwargs)
+                _store_response(key, now, response)
+            return response
+        return wrapper
+    return decorator
+
+
+def count_lines(filepath: Union[str, Path], stat: Optional[os.stat_result] = None) -> int:
+    """
+    Count newline-terminated lines, reusing the previous count for unchanged files
+    
+    Appended files are counted incrementally from the last known offset.
+    Files that were truncated and rewritten are recounted from the start.
+    
+    Args:
+        filepath: Path to the file
+        stat: Existing stat result for the file, to avoid another syscall
+    
+    Returns:
+        Number of lines in the file
+    """
+    key = str(filepath)
+    stat = stat or os.stat(key)
+    lines, offset = 0, 0
+    
+    cached = _LINE_COUNT_CACHE.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    
+    with open(key, 'rb') as f:
+        fingerprint = read_fingerprint(f)
+        if cached and stat.st_size >= cached[3] and fingerprint.startswith(cached[4]):
+            lines, offset = cached[2], cached[3]
+        
+        f.seek(offset)
+        while chunk := f.read(COUNT_CHUNK_BYTES):
+            lines += chunk.count(b'\n')
+            offset += len(chunk)
+    
+    _LINE_COUNT_CACHE[key] = (stat.st_mtime_ns, stat.st_size, lines, offset, fingerprint)
+    return lines
 
 
 def read_latest_jsonl(filepath: Path, max_lines: int = 100) -> List[Dict[str, Any]]:
     """
     Read the latest entries from a JSONL file
     
+    Served from the in-memory output buffer when the watcher is running.
+    
     Args:
         filepath: Path to the JSONL file
         max_lines: Maximum number of lines to return (from end of file)
@@ -29,35 +147,83 @@ def read_latest_jsonl(filepath: Path, max_lines: int = 100) -> List[Dict[str, An
     Returns:
         List of dictionaries containing the parsed JSON data
     """
+    if filepath.parent == PATHWAY_OUTPUT_DIR:
+        cached = pathway_output_service.get_latest(filepath.name, max_lines)
+        if cached is not None:
+            return cached
+    
     if not filepath.exists():
         return []
     
     try:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-            
-        # Get the last N lines
-        recent_lines = lines[-max_lines:] if len(lines) > max_lines else lines
-        
-        # Parse JSON and filter out deleted entries (Pathway marks deletes with diff=-1)
-        results = []
-        for line in recent_lines:
-            try:
-                data = json.loads(line)
-                # Pathway output format includes metadata
-                # Skip deleted entries
-                if data.get('diff', 1) > 0:
-                    results.append(data)
-            except json.JSONDecodeError:
-                continue
-        
-        return results
+        return parse_jsonl_lines(read_tail_lines(filepath, max_lines))
     except Exception as e:
         print(f"Error reading {filepath}: {e}")
         return []
 
 
+def iter_latest_jsonl(filepath: Path, max_lines: int = 100) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the latest entries of a JSONL file, newest first
+    
+    Lines are only parsed as they are consumed, so callers can stop early.
+    """
+    if filepath.parent == PATHWAY_OUTPUT_DIR:
+        cached = pathway_output_service.get_latest(filepath.name, max_lines)
+        if cached is not None:
+            return reversed(cached)
+    
+    if not filepath.exists():
+        return iter(())
+    
+    return iter_jsonl_reversed(filepath, max_lines)
+
+
+def latest_by_device_type(entries: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Keep the most recent entry for each device type
+    
+    Stops once STATS_SCAN_PATIENCE consecutive entries add no new device type.
+    
+    Args:
+        entries: Entries ordered newest first
+    
+    Returns:
+        Latest entry per device type, ordered by device type
+    """
+    latest = {}
+    seen_without_new = 0
+    for entry in entries:
+        device_type = entry.get('device_type')
+        if not device_type or device_type in latest:
+            seen_without_new += 1
+            if seen_without_new >= STATS_SCAN_PATIENCE:
+                break
+            continue
+        latest[device_type] = entry
+        seen_without_new = 0
+    return dict(sorted(latest.items()))
+
+
+def read_latest_statistics() -> Dict[str, Dict[str, Any]]:
+    """Read the latest statistics entry for each device type"""
+    filepath = PATHWAY_OUTPUT_DIR / "device_stats.jsonl"
+    try:
+        return latest_by_device_type(iter_latest_jsonl(filepath, STATS_SCAN_LINES))
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}")
+        return {}
+
+
+async def read_off_loop(filename: str, func: Callable[..., Any], *args: Any) -> Any:
+    """Run a reader inline when the file is buffered in memory, otherwise in a worker thread"""
+    if pathway_output_service.is_ready(filename):
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
+
+
 @router.get("/anomalies")
+@cached_response("anomalies.jsonl")
 def get_anomalies(limit: int = 50):
     """
     Get recent anomalies detected by Pathway
@@ -81,6 +247,7 @@ def get_anomalies(limit: int = 50):
 
 
 @router.get("/statistics")
+@cached_response("device_stats.jsonl")
 def get_device_statistics():
     """
     Get real-time device statistics computed by Pathway
@@ -92,15 +259,7 @@ def get_device_statistics():
     
     Updated continuously as new data arrives.
     """
-    filepath = PATHWAY_OUTPUT_DIR / "device_stats.jsonl"
-    stats = read_latest_jsonl(filepath, max_lines=100)
-    
-    # Group by device type (get latest for each)
-    latest_stats = {}
-    for entry in stats:
-        device_type = entry.get('device_type')
-        if device_type:
-            latest_stats[device_type] = entry
+    latest_stats = read_latest_statistics()
     
     return {
         "device_types": list(latest_stats.keys()),
@@ -109,6 +268,7 @@ def get_device_statistics():
 
 
 @router.get("/recommendations")
+@cached_response("recommendations.jsonl")
 def get_recommendations(limit: int = 50):
     """
     Get optimization recommendations from Pathway
@@ -136,6 +296,7 @@ def get_recommendations(limit: int = 50):
 
 
 @router.get("/total-power")
+@cached_response("total_power.jsonl")
 def get_total_power(limit: int = 100):
     """
     Get total power consumption over time
@@ -167,18 +328,18 @@ def get_pathway_status():
     """
     files_info = {}
     
-    for filename in ['anomalies.jsonl', 'device_stats.jsonl', 'recommendations.jsonl', 'total_power.jsonl']:
-        filepath = PATHWAY_OUTPUT_DIR / filename
+    for filename in OUTPUT_FILES:
+        filepath = str(PATHWAY_OUTPUT_DIR / filename)
         
-        if filepath.exists():
-            stat = filepath.stat()
+        try:
+            stat = os.stat(filepath)
             files_info[filename] = {
                 'exists': True,
                 'size_bytes': stat.st_size,
                 'last_modified': stat.st_mtime,
-                'line_count': sum(1 for _ in open(filepath))
+                'line_count': count_lines(filepath, stat)
             }
-        else:
+        except FileNotFoundError:
             files_info[filename] = {
                 'exists': False
             }
@@ -195,7 +356,8 @@ def get_pathway_status():
 
 
 @router.get("/summary")
-def get_summary():
+@cached_response(*OUTPUT_FILES)
+async def get_summary():
     """
     Get a summary of all Pathway processing results
     
@@ -204,15 +366,25 @@ def get_summary():
     - Latest device statistics
     - Recent recommendations
     - Current power consumption
+    
+    Reads that hit disk run concurrently in worker threads; reads served
+    from the in-memory buffer run inline.
     """
+    anomalies, statistics, recommendations, status = await asyncio.gather(
+        read_off_loop("anomalies.jsonl", read_latest_jsonl, PATHWAY_OUTPUT_DIR / "anomalies.jsonl", 20),
+        read_off_loop("device_stats.jsonl", read_latest_statistics),
+        read_off_loop("recommendations.jsonl", read_latest_jsonl, PATHWAY_OUTPUT_DIR / "recommendations.jsonl", 5),
+        asyncio.to_thread(get_pathway_status)
+    )
+    
     return {
         "anomalies": {
-            "recent_count": len(read_latest_jsonl(PATHWAY_OUTPUT_DIR / "anomalies.jsonl", 20)),
-            "latest": read_latest_jsonl(PATHWAY_OUTPUT_DIR / "anomalies.jsonl", 5)
+            "recent_count": len(anomalies),
+            "latest": anomalies[-5:]
         },
-        "statistics": get_device_statistics()['statistics'],
+        "statistics": statistics,
         "recommendations": {
-            "latest": read_latest_jsonl(PATHWAY_OUTPUT_DIR / "recommendations.jsonl", 5)
+            "latest": recommendations
         },
-        "status": get_pathway_status()
+        "status": status
     }
@@ -43,6 +43,7 @@ class PathwayConfig:
     
     # HTTP Request Configuration
     REQUEST_TIMEOUT: Final[int] = 2  # seconds
+    API_CHECK_CACHE_TTL: Final[float] = 5.0  # seconds
     
     @classmethod
     def get_internal_url(cls) -> str:
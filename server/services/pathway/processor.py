@@ -6,27 +6,30 @@ and optimization recommendations.
 """
 
 import pathway as pw
+import io
 import os
 from .config import PathwayConfig
 from .utils import (
-    internal_stream_generator,
+    CLEAN_GRID_RENEWABLE_PCT,
+    HIGH_LOAD_POWER,
+    calculate_cost_per_hour,
+    dumps_jsonl,
     external_stream_generator,
+    stream_device_telemetry,
     get_anomaly_alert,
     get_recommendation,
     generate_llm_recommendation
 )
 
 
+_output_dir_ready = False
+
+
 class DeviceConnector(pw.io.python.ConnectorSubject):
     """Connector for device telemetry stream"""
     
-    def __init__(self):
-        super().__init__()
-        self.generator = internal_stream_generator()
-    
     def run(self):
-        for data in self.generator:
-            self.next(**data)
+        stream_device_telemetry(self.next)
 
 
 class GridConnector(pw.io.python.ConnectorSubject):
@@ -41,6 +44,29 @@ class GridConnector(pw.io.python.ConnectorSubject):
             self.next(**data)
 
 
+class JsonlSink(pw.io.python.ConnectorObserver):
+    """
+    Buffered JSONL writer for table updates
+    
+    Produces the same records as pw.io.jsonlines.write (row fields plus
+    `time` and `diff`), flushing once per committed batch.
+    """
+    
+    BUFFER_SIZE = 64 * 1024
+    
+    def __init__(self, filepath: str):
+        self.writer = io.BufferedWriter(io.FileIO(filepath, 'w'), buffer_size=self.BUFFER_SIZE)
+    
+    def on_change(self, key, row, time, is_addition):
+        self.writer.write(dumps_jsonl({**row, 'time': time, 'diff': 1 if is_addition else -1}))
+    
+    def on_time_end(self, time):
+        self.writer.flush()
+    
+    def on_end(self):
+        self.writer.close()
+
+
 class PathwayProcessor:
     """
     Main Pathway processor for GridSense analytics
@@ -61,7 +87,10 @@ class PathwayProcessor:
         self._ensure_output_directory()
     
     def _ensure_output_directory(self):
-        os.makedirs(self.config.OUTPUT_DIR, exist_ok=True)
+        global _output_dir_ready
+        if not _output_dir_ready:
+            os.makedirs(self.config.OUTPUT_DIR, exist_ok=True)
+            _output_dir_ready = True
     
     def _create_streams(self):
         """
@@ -111,8 +140,9 @@ class PathwayProcessor:
         Returns:
             Stream of detected anomalies
         """
+        threshold = float(self.config.HIGH_CURRENT_THRESHOLD)
         anomalies = device_stream.filter(
-            pw.this.current > self.config.HIGH_CURRENT_THRESHOLD
+            pw.this.current > threshold
         ).select(
             device_id=pw.this.device_id,
             device_type=pw.this.device_type,
@@ -153,6 +183,13 @@ class PathwayProcessor:
         """
         Generate optimization recommendations by joining streams
         
+        A device's recommendation is only re-emitted when its pricing tier,
+        carbon level, load or clean-grid condition changes. Its numeric columns
+        (power, current, cost_per_hour, electricity_price, carbon_intensity,
+        renewable_pct, timestamp) and the amounts quoted in the text are a
+        snapshot of the first sample under those conditions, and are not
+        refreshed while the conditions hold.
+        
         Args:
             device_stream: Input device telemetry stream
             grid_stream: Input grid context stream
@@ -180,31 +217,40 @@ class PathwayProcessor:
             renewable_pct=pw.coalesce(pw.right.renewable_pct, 35.0),
             electricity_price=pw.coalesce(pw.right.electricity_price, 0.15),
             cost_per_hour=pw.apply(
-                lambda p, price: round(p / 1000 * price, 4),
+                calculate_cost_per_hour,
                 device_stream.power,
                 pw.coalesce(pw.right.electricity_price, 0.15)
             ),
-            recommendation=pw.apply(
-                generate_llm_recommendation,
-                device_stream.device_id,
-                device_stream.device_type,
-                device_stream.power,
-                device_stream.current,
-                pw.coalesce(pw.right.carbon_intensity, 500.0),
-                pw.coalesce(pw.right.carbon_level, 'MEDIUM'),
-                pw.coalesce(pw.right.electricity_price, 0.15),
-                pw.coalesce(pw.right.pricing_tier, 'MEDIUM'),
-                pw.coalesce(pw.right.renewable_pct, 35.0),
-                pw.apply(
-                    lambda p, price: round(p / 1000 * price, 4),
-                    device_stream.power,
-                    pw.coalesce(pw.right.electricity_price, 0.15)
-                )
-            ),
             timestamp=device_stream.timestamp
         )
         
-        return combined
+        rule_key = pw.make_tuple(
+            pw.this.pricing_tier,
+            pw.this.carbon_level,
+            pw.this.power > HIGH_LOAD_POWER,
+            pw.this.renewable_pct > CLEAN_GRID_RENEWABLE_PCT
+        )
+        changed = combined.with_columns(rule_key=rule_key).deduplicate(
+            value=pw.this.rule_key,
+            instance=pw.this.device_id,
+            acceptor=lambda new, old: new != old
+        ).without(pw.this.rule_key)
+        
+        return changed.with_columns(
+            recommendation=pw.apply(
+                generate_llm_recommendation,
+                pw.this.device_id,
+                pw.this.device_type,
+                pw.this.power,
+                pw.this.current,
+                pw.this.carbon_intensity,
+                pw.this.carbon_level,
+                pw.this.electricity_price,
+                pw.this.pricing_tier,
+                pw.this.renewable_pct,
+                pw.this.cost_per_hour
+            )
+        )
     
     def run(self):
         """
@@ -227,9 +273,9 @@ class PathwayProcessor:
         recommendations = self._generate_recommendations(device_stream, grid_stream)
         
         print("Writing outputs to files\n")
-        pw.io.jsonlines.write(anomalies, self.config.ANOMALIES_FILE)
-        pw.io.jsonlines.write(device_stats, self.config.DEVICE_STATS_FILE)
-        pw.io.jsonlines.write(recommendations, self.config.RECOMMENDATIONS_FILE)
+        pw.io.python.write(anomalies, JsonlSink(self.config.ANOMALIES_FILE))
+        pw.io.python.write(device_stats, JsonlSink(self.config.DEVICE_STATS_FILE))
+        pw.io.python.write(recommendations, JsonlSink(self.config.RECOMMENDATIONS_FILE))
         
         print("=" * 70)
         print("Pipeline is running! Press Ctrl+C to stop.")
@@ -5,12 +5,32 @@ Helper functions for stream processing, data fetching, and transformations.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
-import json
 import os
-from typing import Dict, Any, Generator
+from operator import itemgetter
+from typing import Callable, Dict, Any, Generator
 from .config import PathwayConfig
 
+try:
+    import orjson
+
+    def dumps_jsonl(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    import json as orjson
+
+    def dumps_jsonl(record: Dict[str, Any]) -> bytes:
+        return (orjson.dumps(record, default=str) + "\n").encode()
+
+# Shared session keeps connections to the API alive across polls
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+_get_telemetry_fields = itemgetter('device_type', 'status', 'voltage', 'current', 'power')
+
 
 def fetch_internal_stream() -> Dict[str, Any]:
     """
@@ -22,12 +42,12 @@ def fetch_internal_stream() -> Dict[str, Any]:
     Raises:
         requests.RequestException: If request fails
     """
-    response = requests.get(
+    response = _session.get(
         PathwayConfig.get_internal_url(),
         timeout=PathwayConfig.REQUEST_TIMEOUT
     )
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
 def fetch_external_stream() -> Dict[str, Any]:
@@ -40,48 +60,51 @@ def fetch_external_stream() -> Dict[str, Any]:
     Raises:
         requests.RequestException: If request fails
     """
-    response = requests.get(
+    response = _session.get(
         PathwayConfig.get_external_url(),
         timeout=PathwayConfig.REQUEST_TIMEOUT
     )
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
-def internal_stream_generator() -> Generator[Dict[str, Any], None, None]:
+def stream_device_telemetry(emit: Callable[..., None]) -> None:
     """
-    Generator function that yields device telemetry data
+    Poll device telemetry and emit one record per device per poll
     
     Polls the internal stream endpoint at configured interval (10Hz default).
-    Yields one record per device per poll.
+    Fields are passed straight to `emit` as keyword arguments, so no
+    intermediate record is built per device.
     
-    Yields:
-        Dictionary with device telemetry fields:
-        - device_id: str
-        - device_type: str
-        - status: str
-        - voltage: float
-        - current: float
-        - power: float
-        - timestamp: float
+    Args:
+        emit: Callback receiving device telemetry fields:
+            - device_id: str
+            - device_type: str
+            - status: str
+            - voltage: float
+            - current: float
+            - power: float
+            - timestamp: float
     """
     print(f"📡 Starting internal stream ({1/PathwayConfig.INTERNAL_POLL_INTERVAL:.0f}Hz)...")
     
     while True:
         try:
             data = fetch_internal_stream()
-            timestamp = data.get('timestamp', time.time())
+            timestamp = float(data.get('timestamp', time.time()))
             
+            # JSON object keys and string fields are already str
             for device_id, telemetry in data.get('devices', {}).items():
-                yield {
-                    'device_id': str(device_id),
-                    'device_type': str(telemetry['device_type']),
-                    'status': str(telemetry['status']),
-                    'voltage': float(telemetry['voltage']),
-                    'current': float(telemetry['current']),
-                    'power': float(telemetry['power']),
-                    'timestamp': float(timestamp)
-                }
+                device_type, status, voltage, current, power = _get_telemetry_fields(telemetry)
+                emit(
+                    device_id=device_id,
+                    device_type=device_type,
+                    status=status,
+                    voltage=float(voltage),
+                    current=float(current),
+                    power=float(power),
+                    timestamp=timestamp
+                )
         except Exception as e:
             print(f"⚠️  Error in internal stream: {e}")
         
@@ -123,21 +146,45 @@ def external_stream_generator() -> Generator[Dict[str, Any], None, None]:
         time.sleep(PathwayConfig.EXTERNAL_POLL_INTERVAL)
 
 
+_api_server_ok_until: float = 0.0
+
+
 def check_api_server() -> bool:
     """
     Check if the GridSense API server is running and accessible
     
+    A successful check is reused for API_CHECK_CACHE_TTL seconds. Failures are
+    not cached so startup retries probe the server every time.
+    
     Returns:
         True if server is accessible, False otherwise
     """
+    global _api_server_ok_until
+    
+    if time.monotonic() < _api_server_ok_until:
+        return True
+    
     try:
-        response = requests.get(
+        response = _session.get(
             f"{PathwayConfig.API_BASE_URL}/api/devices",
             timeout=PathwayConfig.REQUEST_TIMEOUT
         )
-        return response.status_code == 200
     except requests.exceptions.RequestException:
         return False
+    
+    if response.status_code != 200:
+        return False
+    
+    _api_server_ok_until = time.monotonic() + PathwayConfig.API_CHECK_CACHE_TTL
+    return True
+
+
+HIGH_CURRENT_THRESHOLD = PathwayConfig.HIGH_CURRENT_THRESHOLD
+
+INRUSH_ALERT = "⚠️ MOTOR INRUSH: %.1fA"
+FAULT_ALERT = "🚨 FAULT DETECTED: %.1fA"
+HIGH_CURRENT_ALERT = "⚡ HIGH CURRENT: %.1fA"
+ANOMALY_ALERT = "⚠️ ANOMALY: %.1fA"
 
 
 def get_anomaly_alert(current: float, status: str) -> str:
@@ -151,28 +198,36 @@ def get_anomaly_alert(current: float, status: str) -> str:
     Returns:
         Alert message string
     """
-    if status == 'starting' and current > PathwayConfig.HIGH_CURRENT_THRESHOLD:
-        return f"⚠️ MOTOR INRUSH: {current:.1f}A"
+    if status == 'starting' and current > HIGH_CURRENT_THRESHOLD:
+        return INRUSH_ALERT % current
     elif status == 'fault':
-        return f"🚨 FAULT DETECTED: {current:.1f}A"
-    elif current > PathwayConfig.HIGH_CURRENT_THRESHOLD:
-        return f"⚡ HIGH CURRENT: {current:.1f}A"
+        return FAULT_ALERT % current
+    elif current > HIGH_CURRENT_THRESHOLD:
+        return HIGH_CURRENT_ALERT % current
     else:
-        return f"⚠️ ANOMALY: {current:.1f}A"
+        return ANOMALY_ALERT % current
 
 
-def get_recommendation(power: float, carbon_level: str, pricing_tier: str) -> str:
+def calculate_cost_per_hour(power: float, electricity_price: float) -> float:
     """
-    Generate optimization recommendation based on conditions
+    Calculate hourly running cost
     
     Args:
         power: Power consumption in watts
-        carbon_level: Carbon intensity level (LOW, MEDIUM, HIGH)
-        pricing_tier: Pricing tier (LOW, MEDIUM, HIGH)
+        electricity_price: Price per kWh
         
     Returns:
-        Recommendation message string
+        Cost per hour, rounded to 4 decimals
     """
+    return round(power / 1000 * electricity_price, 4)
+
+
+LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+HIGH_LOAD_POWER: float = 500.0  # Watts
+CLEAN_GRID_RENEWABLE_PCT: float = 70.0
+
+
+def _select_recommendation(carbon_level: str, pricing_tier: str) -> str:
     if pricing_tier == 'HIGH' and carbon_level == 'HIGH':
         return "REDUCE LOAD - High Price & Carbon"
     elif pricing_tier == 'HIGH':
@@ -183,6 +238,98 @@ def get_recommendation(power: float, carbon_level: str, pricing_tier: str) -> st
         return "NORMAL OPERATION"
 
 
+# (pricing_tier, carbon_level) -> recommendation
+RECOMMENDATIONS = {
+    (tier, level): _select_recommendation(level, tier)
+    for tier in LEVELS for level in LEVELS
+}
+
+
+def get_recommendation(power: float, carbon_level: str, pricing_tier: str) -> str:
+    """
+    Generate optimization recommendation based on conditions
+    
+    Args:
+        power: Power consumption in watts
+        carbon_level: Carbon intensity level (LOW, MEDIUM, HIGH)
+        pricing_tier: Pricing tier (LOW, MEDIUM, HIGH)
+        
+    Returns:
+        Recommendation message string
+    """
+    recommendation = RECOMMENDATIONS.get((pricing_tier, carbon_level))
+    return recommendation or _select_recommendation(carbon_level, pricing_tier)
+
+
+def _stop_at_peak_price(device_id, power, carbon_intensity, electricity_price, renewable_pct, cost_per_hour):
+    return (
+        f"Grid Price is ${electricity_price:.3f}/kWh (High). "
+        f"Stopping {device_id} will save approx ${cost_per_hour:.2f}/hour."
+    )
+
+
+def _reduce_at_peak_price_and_carbon(device_id, power, carbon_intensity, electricity_price, renewable_pct, cost_per_hour):
+    carbon_per_hour = (power / 1000) * carbon_intensity
+    return (
+        f"Peak pricing (${electricity_price:.3f}/kWh) + High carbon ({carbon_intensity:.0f}gCO2/kWh). "
+        f"Reducing {device_id} saves ${cost_per_hour:.2f}/hr and {carbon_per_hour:.0f}g CO2/hr."
+    )
+
+
+def _defer_at_high_carbon(device_id, power, carbon_intensity, electricity_price, renewable_pct, cost_per_hour):
+    carbon_per_hour = (power / 1000) * carbon_intensity
+    return (
+        f"Carbon intensity is {carbon_intensity:.0f}gCO2/kWh (High). "
+        f"Deferring {device_id} avoids {carbon_per_hour:.0f}g CO2/hr."
+    )
+
+
+def _run_at_optimal_time(device_id, power, carbon_intensity, electricity_price, renewable_pct, cost_per_hour):
+    return (
+        f"Optimal conditions: ${electricity_price:.3f}/kWh, {renewable_pct:.0f}% renewable. "
+        f"Good time to run {device_id}."
+    )
+
+
+def _running_on_clean_grid(device_id, power, carbon_intensity, electricity_price, renewable_pct, cost_per_hour):
+    return (
+        f"Grid is {renewable_pct:.0f}% renewable (Clean energy!). "
+        f"{device_id} running on mostly clean power."
+    )
+
+
+def _operating_normally(device_id, power, carbon_intensity, electricity_price, renewable_pct, cost_per_hour):
+    return (
+        f"{device_id} operating normally. "
+        f"Current cost: ${cost_per_hour:.2f}/hr at ${electricity_price:.3f}/kWh."
+    )
+
+
+def _select_llm_recommendation(pricing_tier: str, carbon_level: str, high_load: bool, clean_grid: bool):
+    if pricing_tier == 'HIGH' and high_load:
+        return _stop_at_peak_price
+    elif pricing_tier == 'HIGH' and carbon_level == 'HIGH':
+        return _reduce_at_peak_price_and_carbon
+    elif carbon_level == 'HIGH' and high_load:
+        return _defer_at_high_carbon
+    elif pricing_tier == 'LOW' and carbon_level == 'LOW':
+        return _run_at_optimal_time
+    elif clean_grid:
+        return _running_on_clean_grid
+    else:
+        return _operating_normally
+
+
+# (pricing_tier, carbon_level, high_load, clean_grid) -> recommendation template
+LLM_RECOMMENDATION_RULES = {
+    (tier, level, high_load, clean_grid): _select_llm_recommendation(tier, level, high_load, clean_grid)
+    for tier in LEVELS
+    for level in LEVELS
+    for high_load in (True, False)
+    for clean_grid in (True, False)
+}
+
+
 def generate_llm_recommendation(
     device_id: str,
     device_type: str,
@@ -200,6 +347,8 @@ def generate_llm_recommendation(
     
     Note: For demo purposes, using deterministic rules instead of LLM API calls
     to avoid latency and API costs during high-frequency stream processing.
+    Rules are precomputed into LLM_RECOMMENDATION_RULES, so each record costs
+    a single dict lookup.
     
     Args:
         device_id: Device identifier
@@ -216,46 +365,9 @@ def generate_llm_recommendation(
     Returns:
         Specific recommendation string
     """
-    
-    if pricing_tier == 'HIGH' and power > 500:
-        savings_per_hour = cost_per_hour
-        return (
-            f"Grid Price is ${electricity_price:.3f}/kWh (High). "
-            f"Stopping {device_id} will save approx ${savings_per_hour:.2f}/hour."
-        )
-    
-    elif pricing_tier == 'HIGH' and carbon_level == 'HIGH':
-        savings_per_hour = cost_per_hour
-        carbon_per_hour = (power / 1000) * carbon_intensity
-        return (
-            f"Peak pricing (${electricity_price:.3f}/kWh) + High carbon ({carbon_intensity:.0f}gCO2/kWh). "
-            f"Reducing {device_id} saves ${savings_per_hour:.2f}/hr and {carbon_per_hour:.0f}g CO2/hr."
-        )
-    
-    elif carbon_level == 'HIGH' and power > 500:
-        carbon_per_hour = (power / 1000) * carbon_intensity
-        return (
-            f"Carbon intensity is {carbon_intensity:.0f}gCO2/kWh (High). "
-            f"Deferring {device_id} avoids {carbon_per_hour:.0f}g CO2/hr."
-        )
-    
-    elif pricing_tier == 'LOW' and carbon_level == 'LOW':
-        return (
-            f"Optimal conditions: ${electricity_price:.3f}/kWh, {renewable_pct:.0f}% renewable. "
-            f"Good time to run {device_id}."
-        )
-    
-    elif renewable_pct > 70:
-        return (
-            f"Grid is {renewable_pct:.0f}% renewable (Clean energy!). "
-            f"{device_id} running on mostly clean power."
-        )
-    
-    else:
-        return (
-            f"{device_id} operating normally. "
-            f"Current cost: ${cost_per_hour:.2f}/hr at ${electricity_price:.3f}/kWh."
-        )
+    key = (pricing_tier, carbon_level, power > HIGH_LOAD_POWER, renewable_pct > CLEAN_GRID_RENEWABLE_PCT)
+    template = LLM_RECOMMENDATION_RULES.get(key) or _select_llm_recommendation(*key)
+    return template(device_id, power, carbon_intensity, electricity_price, renewable_pct, cost_per_hour)
 
 
 def create_llm_prompt(
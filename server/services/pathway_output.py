@@ -0,0 +1,289 @@
+import asyncio
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from watchfiles import awatch
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
+PATHWAY_OUTPUT_DIR = Path("pathway_output")
+OUTPUT_FILES = ['anomalies.jsonl', 'device_stats.jsonl', 'recommendations.jsonl', 'total_power.jsonl']
+TAIL_BYTES_PER_LINE = 2048
+READ_BLOCK_BYTES = 64 * 1024
+FINGERPRINT_BYTES = 256
+WATCHER_RETRY_DELAY = 1.0  # seconds
+
+
+def read_fingerprint(f: BinaryIO) -> bytes:
+    """
+    Read the leading bytes of a file
+
+    Pathway's first record carries its commit time, so a file that was truncated
+    and rewritten past a previously seen offset no longer starts with the same bytes.
+    """
+    f.seek(0)
+    return f.read(FINGERPRINT_BYTES)
+
+
+def iter_lines_reversed(filepath: Path, max_lines: int) -> Iterator[bytes]:
+    """
+    Yield the last non-empty lines of a file, newest first
+
+    Reads the file backwards in READ_BLOCK_BYTES blocks, so only the consumed
+    lines are read from disk. Stops early if the file is truncated mid-scan.
+
+    Args:
+        filepath: Path to the file
+        max_lines: Maximum number of lines to yield (0 for all)
+
+    Yields:
+        Raw lines (without newline characters)
+    """
+    with open(filepath, 'rb') as f:
+        end = os.fstat(f.fileno()).st_size
+        partial = b''
+        count = 0
+
+        while end > 0:
+            start = max(0, end - READ_BLOCK_BYTES)
+            f.seek(start)
+            block = f.read(end - start)
+            if len(block) < end - start:
+                return
+
+            parts = (block + partial).split(b'\n')
+            # First part may continue in the previous block unless we reached the start
+            partial = parts.pop(0) if start > 0 else b''
+            end = start
+
+            for line in reversed(parts):
+                if line.strip():
+                    yield line
+                    count += 1
+                    if 0 < max_lines <= count:
+                        return
+
+
+def read_tail_lines(filepath: Path, max_lines: int) -> List[bytes]:
+    """
+    Read the last non-empty lines of a file without loading the whole file
+
+    Args:
+        filepath: Path to the file
+        max_lines: Maximum number of lines to return (from end of file)
+
+    Returns:
+        List of raw lines (without newline characters), oldest first
+    """
+    lines = list(iter_lines_reversed(filepath, max_lines))
+    lines.reverse()
+    return lines
+
+
+def iter_jsonl_reversed(filepath: Path, max_lines: int) -> Iterator[Dict[str, Any]]:
+    """Yield parsed entries from the last lines of a JSONL file, newest first"""
+    for line in iter_lines_reversed(filepath, max_lines):
+        try:
+            data = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue
+        if isinstance(data, dict) and is_live(data):
+            yield data
+
+
+def is_live(record: Dict[str, Any]) -> bool:
+    """Pathway marks deleted entries with diff=-1"""
+    return record.get('diff', 1) > 0
+
+
+def decode_jsonl_lines(lines: List[bytes]) -> List[Dict[str, Any]]:
+    """
+    Decode raw JSONL lines, skipping malformed and non-object lines
+
+    Lines are decoded in a single pass; per-line error handling only runs
+    when a malformed line is present.
+    """
+    try:
+        records = [orjson.loads(line) for line in lines if line]
+    except orjson.JSONDecodeError:
+        records = []
+        for line in lines:
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+    return [data for data in records if isinstance(data, dict)]
+
+
+def parse_jsonl_lines(lines: List[bytes]) -> List[Dict[str, Any]]:
+    """Parse raw JSONL lines, skipping malformed and deleted entries"""
+    return [data for data in decode_jsonl_lines(lines) if is_live(data)]
+
+
+class JsonlTail:
+    """
+    In-memory ring buffer of the latest records of an append-only JSONL file
+
+    Deleted records are kept and filtered on read, so `limit` counts lines
+    the same way as reading the file tail from disk.
+    """
+
+    def __init__(self, filepath: Path, maxlen: int):
+        self.filepath = filepath
+        self.maxlen = maxlen
+        self.entries = deque(maxlen=maxlen)
+        self.offset = 0
+        self.fingerprint = b''
+        self.ready = False
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        self.offset = 0
+        self.fingerprint = b''
+        with self._lock:
+            self.entries.clear()
+            self.version += 1
+
+    def poll(self):
+        """Append complete lines written since the last poll"""
+        try:
+            with open(self.filepath, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                fingerprint = read_fingerprint(f)
+                if size < self.offset or not fingerprint.startswith(self.fingerprint):
+                    # File was truncated or rewritten
+                    self.reset()
+                self.fingerprint = fingerprint
+
+                # Skip bytes that would be evicted from the buffer anyway
+                start = max(self.offset, size - self.maxlen * TAIL_BYTES_PER_LINE)
+                f.seek(start)
+                chunk = f.read(size - start)
+        except FileNotFoundError:
+            self.reset()
+            self.ready = True
+            return
+
+        end = chunk.rfind(b'\n') + 1
+        if end > 0:
+            lines = chunk[:end].split(b'\n')
+            if start > self.offset:
+                lines = lines[1:]
+            self.offset = start + end
+
+            records = decode_jsonl_lines(lines)
+            with self._lock:
+                self.entries.extend(records)
+                self.version += 1
+
+        self.ready = True
+
+    def latest(self, limit: int) -> List[Dict[str, Any]]:
+        """Live entries among the last `limit` records"""
+        with self._lock:
+            snapshot = list(self.entries)
+        if limit > 0:
+            snapshot = snapshot[-limit:]
+        return [record for record in snapshot if is_live(record)]
+
+
+class PathwayOutputService:
+    """
+    Keeps the latest Pathway output entries in memory
+
+    A background task watches the output directory and tails each JSONL file
+    as Pathway appends to it, so API requests are served without disk IO.
+    """
+
+    def __init__(self, output_dir: Path = PATHWAY_OUTPUT_DIR, maxlen: int = 10000):
+        self.output_dir = output_dir
+        self.tails = {
+            filename: JsonlTail(output_dir / filename, maxlen)
+            for filename in OUTPUT_FILES
+        }
+        self._task = None
+
+    def get_latest(self, filename: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the latest entries for an output file
+
+        Returns None when the watcher is not running, the file has not been
+        tailed successfully, or the buffer cannot hold `limit` entries, so
+        callers can fall back to reading from disk.
+        """
+        tail = self._ready_tail(filename)
+        if tail is None or limit > tail.maxlen:
+            return None
+        return tail.latest(limit)
+
+    def is_ready(self, filename: str) -> bool:
+        """Whether reads for a file are served from memory"""
+        return self._ready_tail(filename) is not None
+
+    def get_version(self, filename: str) -> Optional[int]:
+        """Counter that changes whenever the buffered entries for a file change"""
+        tail = self._ready_tail(filename)
+        return tail.version if tail else None
+
+    def _ready_tail(self, filename: str) -> Optional[JsonlTail]:
+        tail = self.tails.get(filename)
+        if self._task is None or self._task.done() or tail is None or not tail.ready:
+            return None
+        return tail
+
+    async def _poll(self, tail: JsonlTail):
+        try:
+            await asyncio.to_thread(tail.poll)
+        except Exception as e:
+            tail.ready = False
+            tail.reset()
+            print(f"Error tailing {tail.filepath}: {e}")
+
+    async def run_watcher(self):
+        """
+        Background task that tails output files on every filesystem change
+
+        File IO runs in worker threads to keep the event loop free. The watch is
+        restarted after errors, e.g. when the output directory is removed.
+        """
+        while True:
+            try:
+                os.makedirs(self.output_dir, exist_ok=True)
+                await asyncio.gather(*(self._poll(tail) for tail in self.tails.values()))
+
+                async for changes in awatch(self.output_dir, debounce=50, step=50):
+                    for filename in {Path(path).name for _, path in changes}:
+                        tail = self.tails.get(filename)
+                        if tail:
+                            await self._poll(tail)
+            except Exception as e:
+                print(f"Pathway output watcher error: {e}")
+
+            await asyncio.sleep(WATCHER_RETRY_DELAY)
+
+    def start_background_task(self):
+        """Start the output watcher"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_watcher())
+            print("Pathway output watcher initialized")
+
+    async def stop_background_task(self):
+        """Stop the output watcher"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            print("Pathway output watcher stopped")
+
+
+pathway_output_service = PathwayOutputService()
@@ -0,0 +1,193 @@
+"""
+Unit tests for the Pathway output tailing service
+"""
+
+import asyncio
+
+from services import pathway_output
+from services.pathway_output import (
+    JsonlTail,
+    PathwayOutputService,
+    iter_lines_reversed,
+    parse_jsonl_lines,
+    read_tail_lines
+)
+
+
+def write(path, data, mode='wb'):
+    with open(path, mode) as f:
+        f.write(data)
+
+
+def values(tail):
+    return [entry['i'] for entry in tail.latest(tail.maxlen)]
+
+
+def test_iter_lines_reversed_empty_file(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    write(path, b'')
+    assert list(iter_lines_reversed(path, 10)) == []
+
+
+def test_iter_lines_reversed_without_trailing_newline(tmp_path):
+    path = tmp_path / "data.jsonl"
+    write(path, b'a\nb\nc')
+    assert list(iter_lines_reversed(path, 10)) == [b'c', b'b', b'a']
+    assert list(iter_lines_reversed(path, 2)) == [b'c', b'b']
+
+
+def test_iter_lines_reversed_skips_blank_lines(tmp_path):
+    path = tmp_path / "data.jsonl"
+    write(path, b'\na\n\n  \nb\n\n')
+    assert list(iter_lines_reversed(path, 0)) == [b'b', b'a']
+    assert list(iter_lines_reversed(path, 1)) == [b'b']
+
+
+def test_iter_lines_reversed_across_block_boundaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(pathway_output, "READ_BLOCK_BYTES", 7)
+    path = tmp_path / "data.jsonl"
+    lines = [b'line-%d' % i + b'x' * (i % 13) for i in range(50)]
+    write(path, b'\n'.join(lines) + b'\n')
+    assert list(iter_lines_reversed(path, 0)) == lines[::-1]
+    assert list(iter_lines_reversed(path, 3)) == lines[:-4:-1]
+
+
+def test_iter_lines_reversed_stops_when_truncated_mid_scan(tmp_path, monkeypatch):
+    monkeypatch.setattr(pathway_output, "READ_BLOCK_BYTES", 64)
+    path = tmp_path / "data.jsonl"
+    write(path, b''.join(b'{"i": %d}\n' % i for i in range(100)))
+
+    lines = iter_lines_reversed(path, 0)
+    assert next(lines) == b'{"i": 99}'
+
+    # A restarting JsonlSink reopens the file with 'w'
+    open(path, 'w').close()
+    remaining = list(lines)
+    assert len(remaining) < 99
+
+
+def test_parse_jsonl_lines_skips_malformed_deleted_and_non_dict(tmp_path):
+    lines = [b'{"i": 1}', b'{"i": 2, "diff": -1}', b'{bad', b'42', b'[1]', b'{"i": 3}']
+    assert [entry['i'] for entry in parse_jsonl_lines(lines)] == [1, 3]
+
+
+def test_tail_appends_only_new_complete_lines(tmp_path):
+    path = tmp_path / "data.jsonl"
+    write(path, b'{"i": 1}\n{"i": 2}\n{"i": ')
+    tail = JsonlTail(path, maxlen=10)
+    tail.poll()
+    assert values(tail) == [1, 2]
+
+    write(path, b'3}\n{"i": 4}\n', mode='ab')
+    tail.poll()
+    assert values(tail) == [1, 2, 3, 4]
+
+
+def test_tail_applies_limit_before_dropping_deleted_entries(tmp_path):
+    path = tmp_path / "data.jsonl"
+    write(path, b''.join(b'{"i": %d, "diff": %d}\n' % (i, 1 if i % 2 else -1) for i in range(8)))
+    tail = JsonlTail(path, maxlen=10)
+    tail.poll()
+    assert [entry['i'] for entry in tail.latest(4)] == [5, 7]
+    assert [entry['i'] for entry in tail.latest(4)] == [
+        entry['i'] for entry in parse_jsonl_lines(read_tail_lines(path, 4))
+    ]
+
+
+def test_tail_version_changes_with_entries(tmp_path):
+    path = tmp_path / "data.jsonl"
+    write(path, b'{"i": 1}\n')
+    tail = JsonlTail(path, maxlen=10)
+    tail.poll()
+    version = tail.version
+
+    tail.poll()
+    assert tail.version == version
+
+    write(path, b'{"i": 2}\n', mode='ab')
+    tail.poll()
+    assert tail.version != version
+
+
+def test_tail_keeps_only_maxlen_entries(tmp_path):
+    path = tmp_path / "data.jsonl"
+    write(path, b''.join(b'{"i": %d}\n' % i for i in range(20)))
+    tail = JsonlTail(path, maxlen=5)
+    tail.poll()
+    assert values(tail) == [15, 16, 17, 18, 19]
+
+
+def test_tail_resets_on_truncation(tmp_path):
+    path = tmp_path / "data.jsonl"
+    write(path, b'{"time": 1, "i": 1}\n{"time": 1, "i": 2}\n')
+    tail = JsonlTail(path, maxlen=10)
+    tail.poll()
+
+    write(path, b'{"time": 2, "i": 9}\n')
+    tail.poll()
+    assert values(tail) == [9]
+
+
+def test_tail_resets_on_truncate_and_regrow_between_polls(tmp_path):
+    path = tmp_path / "data.jsonl"
+    write(path, b'{"time": 1, "i": 1}\n')
+    tail = JsonlTail(path, maxlen=10)
+    tail.poll()
+
+    write(path, b'{"time": 2, "i": 7}\n{"time": 2, "i": 8}\n{"time": 2, "i": 9}\n')
+    tail.poll()
+    assert values(tail) == [7, 8, 9]
+
+
+def test_tail_clears_entries_when_file_is_deleted(tmp_path):
+    path = tmp_path / "data.jsonl"
+    write(path, b'{"i": 1}\n')
+    tail = JsonlTail(path, maxlen=10)
+    tail.poll()
+
+    path.unlink()
+    tail.poll()
+    assert values(tail) == []
+    assert tail.ready
+
+    write(path, b'{"i": 2}\n')
+    tail.poll()
+    assert values(tail) == [2]
+
+
+def test_get_latest_requires_running_watcher(tmp_path):
+    service = PathwayOutputService(output_dir=tmp_path, maxlen=10)
+    write(tmp_path / "anomalies.jsonl", b'{"i": 1}\n')
+    tail = service.tails["anomalies.jsonl"]
+    tail.poll()
+    assert service.get_latest("anomalies.jsonl", 5) is None
+
+    async def finished():
+        pass
+
+    async def check():
+        service._task = asyncio.ensure_future(asyncio.sleep(60))
+        assert service.get_latest("anomalies.jsonl", 5) == [{'i': 1}]
+        assert service.get_latest("anomalies.jsonl", 11) is None
+
+        service._task.cancel()
+        service._task = asyncio.ensure_future(finished())
+        await service._task
+        assert service.get_latest("anomalies.jsonl", 5) is None
+
+    asyncio.run(check())
+
+
+def test_failed_poll_marks_tail_not_ready(tmp_path):
+    service = PathwayOutputService(output_dir=tmp_path, maxlen=10)
+    tail = service.tails["anomalies.jsonl"]
+    write(tmp_path / "anomalies.jsonl", b'{"i": 1}\n')
+    tail.poll()
+
+    def broken_poll():
+        raise PermissionError("denied")
+
+    tail.poll = broken_poll
+    asyncio.run(service._poll(tail))
+    assert not tail.ready
+    assert values(tail) == []
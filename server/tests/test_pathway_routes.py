@@ -0,0 +1,129 @@
+"""
+Unit tests for Pathway route helpers
+"""
+
+import asyncio
+
+from routes import pathway_routes
+from routes.pathway_routes import _LINE_COUNT_CACHE, count_lines
+from services.pathway_output import PATHWAY_OUTPUT_DIR, pathway_output_service
+
+
+def write_lines(path, lines, mode='wb'):
+    with open(path, mode) as f:
+        f.write(b''.join(line + b'\n' for line in lines))
+
+
+def test_count_lines_counts_appended_lines(tmp_path):
+    path = tmp_path / "anomalies.jsonl"
+    write_lines(path, [b'{"time": 1}', b'{"time": 2}'])
+    assert count_lines(path) == 2
+
+    write_lines(path, [b'{"time": 3}'], mode='ab')
+    assert count_lines(path) == 3
+
+
+def test_count_lines_recounts_truncated_and_regrown_file(tmp_path):
+    path = tmp_path / "anomalies.jsonl"
+    write_lines(path, [b'{"time": 1, "i": %d}' % i for i in range(1000)])
+    assert count_lines(path) == 1000
+
+    write_lines(path, [b'{"time": 2, "i": %d, "pad": "xxxxxxxx"}' % i for i in range(1000)])
+    assert count_lines(path) == 1000
+
+
+def test_count_lines_recounts_shrunk_file(tmp_path):
+    path = tmp_path / "anomalies.jsonl"
+    write_lines(path, [b'{"time": 1}'] * 10)
+    assert count_lines(path) == 10
+
+    write_lines(path, [b'{"time": 2}'] * 3)
+    assert count_lines(path) == 3
+    assert _LINE_COUNT_CACHE[str(path)][2] == 3
+
+
+def test_anomalies_match_with_and_without_watcher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    PATHWAY_OUTPUT_DIR.mkdir()
+    write_lines(
+        PATHWAY_OUTPUT_DIR / "anomalies.jsonl",
+        [b'{"i": %d, "diff": %d}' % (i, 1 if i % 2 else -1) for i in range(8)]
+    )
+    unwrapped = pathway_routes.get_anomalies.__wrapped__
+    from_disk = unwrapped(limit=4)
+
+    async def from_buffer():
+        tail = pathway_output_service.tails["anomalies.jsonl"]
+        tail.reset()
+        tail.poll()
+        monkeypatch.setattr(pathway_output_service, "_task", asyncio.ensure_future(asyncio.sleep(60)))
+        try:
+            assert pathway_output_service.get_latest("anomalies.jsonl", 4) is not None
+            return unwrapped(limit=4)
+        finally:
+            pathway_output_service._task.cancel()
+            tail.reset()
+            tail.ready = False
+
+    assert asyncio.run(from_buffer()) == from_disk
+    assert from_disk["count"] == 2
+
+
+def test_summary_reads_buffered_files_inline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    threaded = []
+
+    async def fake_to_thread(func, *args):
+        threaded.append(func)
+        return func(*args)
+
+    monkeypatch.setattr(pathway_routes.asyncio, "to_thread", fake_to_thread)
+    monkeypatch.setattr(
+        pathway_output_service, "is_ready", lambda filename: filename != "device_stats.jsonl"
+    )
+    monkeypatch.setattr(pathway_routes, "read_latest_jsonl", lambda filepath, max_lines: [])
+
+    summary = asyncio.run(pathway_routes.get_summary.__wrapped__())
+    assert summary["anomalies"]["recent_count"] == 0
+    assert pathway_routes.read_latest_statistics in threaded
+    assert pathway_routes.get_pathway_status in threaded
+    assert len(threaded) == 2
+
+
+def test_latest_by_device_type_keeps_newest_entry_in_stable_order():
+    entries = [
+        {'device_type': 'motor', 'n': 3},
+        {'device_type': 'hvac', 'n': 3},
+        {'device_type': 'motor', 'n': 2},
+        {'device_type': 'compressor', 'n': 2},
+    ]
+    latest = pathway_routes.latest_by_device_type(entries)
+    assert list(latest) == ['compressor', 'hvac', 'motor']
+    assert latest['motor']['n'] == 3
+
+
+def test_latest_by_device_type_stops_after_patience(monkeypatch):
+    monkeypatch.setattr(pathway_routes, "STATS_SCAN_PATIENCE", 3)
+    # The first entry is new, so three repeats are needed to stop
+    entries = [{'device_type': 'motor'}] * 4 + [{'device_type': 'hvac'}]
+    assert list(pathway_routes.latest_by_device_type(entries)) == ['motor']
+
+    entries = [{'device_type': 'motor'}] * 3 + [{'device_type': 'hvac'}]
+    assert list(pathway_routes.latest_by_device_type(entries)) == ['hvac', 'motor']
+
+    # Entries without a device type count towards the patience
+    entries = [{'device_type': 'motor'}, {}, {'diff': 1}, {}, {'device_type': 'hvac'}]
+    assert list(pathway_routes.latest_by_device_type(entries)) == ['motor']
+
+
+def test_latest_by_device_type_stops_consuming_entries(monkeypatch):
+    monkeypatch.setattr(pathway_routes, "STATS_SCAN_PATIENCE", 2)
+    consumed = []
+
+    def entries():
+        for n in range(100):
+            consumed.append(n)
+            yield {'device_type': 'motor'}
+
+    pathway_routes.latest_by_device_type(entries())
+    assert len(consumed) == 3